@@ -24,7 +24,10 @@ class CopilotAgent(BaseCLIAgent):
         duration_seconds: float,
         output_file_content: str | None,
     ) -> AgentOutput | None:
-        combined = "\n".join(part for part in (stdout, stderr) if part).strip()
+        if stdout and stderr:
+            combined = f"{stdout}\n{stderr}".strip()
+        else:
+            combined = (stdout or stderr).strip()
         if not combined:
             return None
 
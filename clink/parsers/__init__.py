@@ -17,13 +17,20 @@ _PARSER_CLASSES: dict[str, type[BaseParser]] = {
     QwenStreamJsonParser.name: QwenStreamJsonParser,
 }
 
+# Parsers keep no per-call state, so one instance per parser is shared by all agents.
+_PARSER_INSTANCES: dict[str, BaseParser] = {}
+
 
 def get_parser(name: str) -> BaseParser:
     normalized = (name or "").lower()
+    parser = _PARSER_INSTANCES.get(normalized)
+    if parser is not None:
+        return parser
     if normalized not in _PARSER_CLASSES:
         raise ParserError(f"No parser registered for '{name}'")
-    parser_cls = _PARSER_CLASSES[normalized]
-    return parser_cls()
+    parser = _PARSER_CLASSES[normalized]()
+    _PARSER_INSTANCES[normalized] = parser
+    return parser
 
 
 __all__ = [
@@ -10,6 +10,8 @@ from typing import Any
 class ParsedCLIResponse:
     """Result of parsing CLI stdout/stderr."""
 
+    __slots__ = ("content", "metadata")
+
     content: str
     metadata: dict[str, Any]
 
@@ -21,6 +23,8 @@ class ParserError(RuntimeError):
 class BaseParser:
     """Base interface for CLI output parsers."""
 
+    __slots__ = ()
+
     name: str = "base"
 
     def parse(self, stdout: str, stderr: str) -> ParsedCLIResponse:
@@ -11,6 +11,8 @@ from .base import BaseParser, ParsedCLIResponse, ParserError
 class ClaudeJSONParser(BaseParser):
     """Parse stdout produced by `claude --output-format json`."""
 
+    __slots__ = ()
+
     name = "claude_json"
 
     def parse(self, stdout: str, stderr: str) -> ParsedCLIResponse:
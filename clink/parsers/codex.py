@@ -11,6 +11,8 @@ from .base import BaseParser, ParsedCLIResponse, ParserError
 class CodexJSONLParser(BaseParser):
     """Parse stdout emitted by `codex exec --json`."""
 
+    __slots__ = ()
+
     name = "codex_jsonl"
 
     def parse(self, stdout: str, stderr: str) -> ParsedCLIResponse:
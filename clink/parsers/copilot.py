@@ -8,12 +8,14 @@ from .base import BaseParser, ParsedCLIResponse, ParserError
 class CopilotPlaintextParser(BaseParser):
     """Parse stdout produced by `copilot --silent`."""
 
+    __slots__ = ()
+
     name = "copilot_plaintext"
 
     def parse(self, stdout: str, stderr: str) -> ParsedCLIResponse:
         content = stdout.strip()
+        stderr_text = stderr.strip()
         if not content:
-            stderr_text = stderr.strip()
             if stderr_text:
                 return ParsedCLIResponse(
                     content="Copilot CLI returned no textual result. Raw stderr was preserved for troubleshooting.",
@@ -22,7 +24,6 @@ class CopilotPlaintextParser(BaseParser):
             raise ParserError("Copilot CLI returned empty output")
 
         metadata: dict = {}
-        stderr_text = stderr.strip()
         if stderr_text:
             metadata["stderr"] = stderr_text
 
@@ -11,6 +11,8 @@ from .base import BaseParser, ParsedCLIResponse, ParserError
 class GeminiJSONParser(BaseParser):
     """Parse stdout produced by `gemini -o json`."""
 
+    __slots__ = ()
+
     name = "gemini_json"
 
     def parse(self, stdout: str, stderr: str) -> ParsedCLIResponse:
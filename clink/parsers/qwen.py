@@ -2,11 +2,33 @@
 
 from __future__ import annotations
 
-import json
+import io
+from collections import deque
+from collections.abc import Iterable
+from json import loads as _json_loads
 from typing import Any
 
 from .base import BaseParser, ParsedCLIResponse, ParserError
 
+# Use the fastest JSON decoder importable: orjson, then ujson, then the stdlib.
+# Either fast decoder is picked up whenever it is installed, including as another
+# package's dependency; the ``fast-json`` extra only makes orjson explicit.
+# The fast decoders are not drop-in equivalents: they reject some input json
+# accepts, which parse_stream() retries with json.loads, and orjson returns
+# integers wider than 64 bits as floats.
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        from ujson import loads as _loads
+    except ImportError:
+        from json import loads as _loads
+
+# Slot index for each event type the parser keeps. Each slot holds the latest event
+# of its type seen up to and including the first result event that carries text.
+_EVENT_SLOTS: dict[str, int] = {"result": 0, "assistant": 1, "system": 2}
+_RESULT_SLOT = _EVENT_SLOTS["result"]
+
 
 class QwenStreamJsonParser(BaseParser):
     """Parse stdout produced by `qwen -o stream-json`.
@@ -19,99 +41,139 @@ class QwenStreamJsonParser(BaseParser):
     cause EPIPE errors and truncated output.
     """
 
-    name = "qwen_stream_json"
+    __slots__ = ("_keep_raw_events", "_max_events")
 
-    def parse(self, stdout: str, stderr: str) -> ParsedCLIResponse:
-        if not stdout.strip():
-            raise ParserError("Qwen CLI returned empty stdout while stream-json output was expected")
+    name = "qwen_stream_json"
 
-        lines = [line.strip() for line in stdout.splitlines() if line.strip()]
-        events: list[dict[str, Any]] = []
-        result_message: dict[str, Any] | None = None
-        last_assistant_message: dict[str, Any] | None = None
-        system_message: dict[str, Any] | None = None
-        errors: list[str] = []
+    def __init__(self, keep_raw_events: bool = False, max_events: int | None = None) -> None:
+        # Decoded events are only retained on request; long sessions otherwise
+        # keep the whole transcript alive through metadata["raw_events"].
+        if max_events is not None:
+            if not keep_raw_events:
+                raise ValueError("max_events requires keep_raw_events=True")
+            if max_events < 0:
+                raise ValueError(f"max_events must be non-negative, got {max_events}")
+        self._keep_raw_events = keep_raw_events
+        self._max_events = max_events
 
-        for line in lines:
-            if not line.startswith("{"):
+    def parse(self, stdout: str, stderr: str) -> ParsedCLIResponse:
+        return self.parse_stream(stdout.splitlines(), stderr)
+
+    def parse_stream(self, lines: Iterable[str], stderr: str) -> ParsedCLIResponse:
+        """Parse stream-json output from an iterable of lines.
+
+        Lines are consumed one at a time, so callers can pass a file object or
+        any other line iterator without buffering the whole transcript first.
+        Unless raw events are kept, reading stops at the first result event carrying
+        text, so the iterator is not drained; callers passing a live pipe must
+        consume the rest themselves.
+        """
+
+        saw_output = False
+        events: deque[dict[str, Any]] | None = deque(maxlen=self._max_events) if self._keep_raw_events else None
+        object_lines = 0
+        slots: list[dict[str, Any] | None] = [None, None, None]
+        slot_for_type = _EVENT_SLOTS.get
+        # Without raw event retention, lines that cannot carry one of the slotted
+        # types (user/tool events, etc.) are skipped before decoding.
+        sniff = events is None
+        result_done = False
+        error_msg: str | None = None
+
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line:
+                continue
+            saw_output = True
+            if line[0] != "{":
+                continue
+            object_lines += 1
+            if sniff and '"result"' not in line and '"assistant"' not in line and '"system"' not in line:
                 continue
             try:
-                event = json.loads(line)
-            except json.JSONDecodeError:
+                event = _loads(line)
+            except ValueError:
+                # orjson rejects some input the stdlib accepts (lone surrogates
+                # from truncated emoji, NaN), so retry before skipping the line.
+                if _loads is _json_loads:
+                    continue
+                try:
+                    event = _json_loads(line)
+                except ValueError:
+                    continue
+
+            if events is not None:
+                events.append(event)
+            if result_done:
                 continue
+            try:
+                slot = slot_for_type(event.get("type"))
+            except TypeError:  # unhashable "type" value
+                continue
+            if slot is not None:
+                slots[slot] = event
+                # A result with text is the response; later events cannot change it.
+                # Raw event retention keeps reading, but the slots stay frozen.
+                if slot == _RESULT_SLOT:
+                    result_text = event.get("result")
+                    if type(result_text) is str and result_text.strip():
+                        if events is None:
+                            break
+                        result_done = True
+
+        if not saw_output:
+            raise ParserError("Qwen CLI returned empty stdout while stream-json output was expected")
 
-            events.append(event)
-            event_type = event.get("type")
-
-            if event_type == "result":
-                result_message = event
-            elif event_type == "assistant":
-                last_assistant_message = event
-            elif event_type == "system":
-                system_message = event
+        result_message, last_assistant_message, system_message = slots
 
         # Build metadata
-        metadata: dict[str, Any] = {"raw_events": events}
-
-        if system_message:
-            metadata["session_id"] = system_message.get("session_id")
-            metadata["model"] = system_message.get("model")
-            if "qwen_code_version" in system_message:
-                metadata["cli_version"] = system_message.get("qwen_code_version")
+        # object_lines_count counts every '{'-prefixed line read, whether or not it
+        # was decoded; raw_events (when kept) holds only the lines that decoded.
+        metadata: dict[str, Any] = {"object_lines_count": object_lines}
+        if events is not None:
+            metadata["raw_events"] = list(events)
+        stderr_text = stderr.strip() if stderr else ""
+        if stderr_text:
+            metadata["stderr"] = stderr_text
+
+        if system_message is not None:
+            system_get = system_message.get
+            metadata["session_id"] = system_get("session_id")
+            metadata["model"] = system_get("model")
+            cli_version = system_get("qwen_code_version")
+            if cli_version is not None:
+                metadata["cli_version"] = cli_version
 
         # Extract content from result message (preferred)
         if result_message:
-            metadata["is_error"] = result_message.get("is_error", False)
-            metadata["num_turns"] = result_message.get("num_turns")
-            metadata["duration_ms"] = result_message.get("duration_ms")
-            metadata["duration_api_ms"] = result_message.get("duration_api_ms")
-
-            usage = result_message.get("usage")
-            if isinstance(usage, dict):
-                metadata["usage"] = usage
-
-            model_usage = result_message.get("modelUsage")
-            if isinstance(model_usage, dict) and model_usage:
-                metadata["model_usage"] = model_usage
-                first_model = next(iter(model_usage.keys()))
-                metadata["model_used"] = first_model
-
-            permission_denials = result_message.get("permission_denials")
-            if isinstance(permission_denials, list) and permission_denials:
-                metadata["permission_denials"] = permission_denials
+            self._extract_result_metadata(result_message, metadata)
 
             # Check for error result
             if result_message.get("is_error"):
                 error_info = result_message.get("error")
                 if isinstance(error_info, dict):
                     error_msg = error_info.get("message", "Unknown error")
-                    errors.append(error_msg)
                     metadata["error"] = error_info
 
             # Get result text
             result_text = result_message.get("result")
-            if isinstance(result_text, str) and result_text.strip():
-                if stderr and stderr.strip():
-                    metadata["stderr"] = stderr.strip()
-                return ParsedCLIResponse(content=result_text.strip(), metadata=metadata)
+            if isinstance(result_text, str):
+                result_text = result_text.strip()
+                if result_text:
+                    return ParsedCLIResponse(content=result_text, metadata=metadata)
 
         # Fall back to extracting text from last assistant message
         if last_assistant_message:
             content = self._extract_assistant_text(last_assistant_message)
             if content:
-                if stderr and stderr.strip():
-                    metadata["stderr"] = stderr.strip()
                 return ParsedCLIResponse(content=content, metadata=metadata)
 
-        # If we have errors, return them
-        if errors:
-            if stderr and stderr.strip():
-                metadata["stderr"] = stderr.strip()
-            return ParsedCLIResponse(content="\n".join(errors), metadata=metadata)
+        # If the result reported an error, return it
+        if error_msg is not None:
+            return ParsedCLIResponse(content=error_msg, metadata=metadata)
 
         # Last resort: check stderr
-        if stderr and stderr.strip():
-            metadata["stderr"] = stderr.strip()
+        if stderr_text:
             return ParsedCLIResponse(
                 content="Qwen CLI returned no textual result. Raw stderr was preserved for troubleshooting.",
                 metadata=metadata,
@@ -119,29 +181,61 @@ class QwenStreamJsonParser(BaseParser):
 
         raise ParserError("Qwen CLI stream-json output did not contain a result or assistant message")
 
+    def _extract_result_metadata(self, result_message: dict[str, Any], metadata: dict[str, Any]) -> None:
+        """Copy the fixed set of result-event fields into metadata."""
+        get = result_message.get
+        metadata["is_error"] = get("is_error", False)
+        metadata["num_turns"] = get("num_turns")
+        metadata["duration_ms"] = get("duration_ms")
+        metadata["duration_api_ms"] = get("duration_api_ms")
+
+        usage = get("usage")
+        if type(usage) is dict:
+            metadata["usage"] = usage
+
+        model_usage = get("modelUsage")
+        if type(model_usage) is dict and model_usage:
+            metadata["model_usage"] = model_usage
+            metadata["model_used"] = next(iter(model_usage))
+
+        permission_denials = get("permission_denials")
+        if type(permission_denials) is list and permission_denials:
+            metadata["permission_denials"] = permission_denials
+
     def _extract_assistant_text(self, assistant_msg: dict[str, Any]) -> str | None:
         """Extract text content from an assistant message."""
+        # Decoded JSON only ever yields exact dict/list/str instances.
         message = assistant_msg.get("message")
-        if not isinstance(message, dict):
+        if type(message) is not dict:
             return None
 
         content_blocks = message.get("content")
-        if not isinstance(content_blocks, list):
+        if type(content_blocks) is not list:
             return None
 
-        text_parts: list[str] = []
+        buffer = io.StringIO()
+        wrote = False
         for block in content_blocks:
-            if not isinstance(block, dict):
+            if type(block) is not dict:
                 continue
             block_type = block.get("type")
+            part = None
             if block_type == "text":
                 text = block.get("text")
-                if isinstance(text, str) and text.strip():
-                    text_parts.append(text.strip())
+                if type(text) is str:
+                    part = text.strip()
             elif block_type == "thinking":
                 # Optionally include thinking content
                 thinking = block.get("thinking")
-                if isinstance(thinking, str) and thinking.strip():
-                    text_parts.append(f"[Thinking: {thinking.strip()}]")
+                if type(thinking) is str:
+                    thinking = thinking.strip()
+                    if thinking:
+                        part = f"[Thinking: {thinking}]"
+            if not part:
+                continue
+            if wrote:
+                buffer.write("\n\n")
+            buffer.write(part)
+            wrote = True
 
-        return "\n\n".join(text_parts) if text_parts else None
+        return buffer.getvalue() if wrote else None
@@ -0,0 +1,80 @@
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from clink.agents.base import CLIAgentError
+from clink.agents.copilot import CopilotAgent
+from clink.models import ResolvedCLIClient, ResolvedCLIRole
+
+
+class DummyProcess:
+    def __init__(self, *, stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0):
+        self._stdout = stdout
+        self._stderr = stderr
+        self.returncode = returncode
+
+    async def communicate(self, _input):
+        return self._stdout, self._stderr
+
+
+@pytest.fixture()
+def copilot_agent():
+    prompt_path = Path("systemprompts/clink/default.txt").resolve()
+    role = ResolvedCLIRole(name="default", prompt_path=prompt_path, role_args=[])
+    client = ResolvedCLIClient(
+        name="copilot",
+        executable=["copilot"],
+        internal_args=["--silent"],
+        config_args=["--allow-all-tools", "--no-color"],
+        env={},
+        timeout_seconds=30,
+        parser="copilot_plaintext",
+        roles={"default": role},
+        output_to_file=None,
+        working_dir=None,
+    )
+    return CopilotAgent(client), role
+
+
+async def _run_agent_with_process(monkeypatch, agent, role, process):
+    async def fake_create_subprocess_exec(*_args, **_kwargs):
+        return process
+
+    def fake_which(executable_name):
+        return f"/usr/bin/{executable_name}"
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_create_subprocess_exec)
+    monkeypatch.setattr(shutil, "which", fake_which)
+    return await agent.run(role=role, prompt="do something", files=[], images=[])
+
+
+@pytest.mark.asyncio
+async def test_copilot_agent_recovers_stdout_and_stderr(monkeypatch, copilot_agent):
+    agent, role = copilot_agent
+    process = DummyProcess(stdout=b"Partial answer\n", stderr=b"  rate limited  \n", returncode=1)
+    result = await _run_agent_with_process(monkeypatch, agent, role, process)
+
+    assert result.returncode == 1
+    assert result.parsed.content == "Partial answer\n\n  rate limited"
+    assert result.parsed.metadata["cli_error_recovered"] is True
+
+
+@pytest.mark.asyncio
+async def test_copilot_agent_recovers_single_stream(monkeypatch, copilot_agent):
+    agent, role = copilot_agent
+    process = DummyProcess(stderr=b"  only stderr  ", returncode=2)
+    result = await _run_agent_with_process(monkeypatch, agent, role, process)
+
+    assert result.parsed.content == "only stderr"
+    assert result.parsed.metadata["cli_returncode"] == 2
+
+
+@pytest.mark.asyncio
+async def test_copilot_agent_propagates_empty_failure(monkeypatch, copilot_agent):
+    agent, role = copilot_agent
+    process = DummyProcess(stdout=b"  \n", returncode=1)
+
+    with pytest.raises(CLIAgentError):
+        await _run_agent_with_process(monkeypatch, agent, role, process)
@@ -1,5 +1,6 @@
 import pytest
 
+from clink.parsers import get_parser
 from clink.parsers.base import ParserError
 from clink.parsers.codex import CodexJSONLParser
 
@@ -20,3 +21,12 @@ def test_codex_parser_requires_agent_message():
     stdout = '{"type":"turn.completed"}'
     with pytest.raises(ParserError):
         parser.parse(stdout=stdout, stderr="")
+
+
+def test_get_parser_reuses_instances():
+    parser = get_parser("qwen_stream_json")
+    assert get_parser("QWEN_STREAM_JSON") is parser
+    assert get_parser("copilot_plaintext") is get_parser("copilot_plaintext")
+
+    with pytest.raises(ParserError):
+        get_parser("unknown")
@@ -1,5 +1,7 @@
 """Tests for the Qwen stream-json parser."""
 
+import io
+
 import pytest
 
 from clink.parsers.base import ParserError
@@ -29,7 +31,8 @@ class TestQwenStreamJsonParser:
         assert result.metadata["is_error"] is False
         assert result.metadata["num_turns"] == 1
         assert result.metadata["duration_ms"] == 1000
-        assert len(result.metadata["raw_events"]) == 3
+        assert result.metadata["object_lines_count"] == 3
+        assert "raw_events" not in result.metadata
 
     def test_parses_error_result(self):
         """Parser handles error results correctly."""
@@ -149,11 +152,124 @@ class TestQwenStreamJsonParser:
             ]
         )
 
-        parser = QwenStreamJsonParser()
+        parser = QwenStreamJsonParser(keep_raw_events=True)
         result = parser.parse(stdout, "")
 
         assert result.content == "Success!"
         assert len(result.metadata["raw_events"]) == 2  # Only valid JSON objects
+        assert result.metadata["object_lines_count"] == 2
+
+    def test_object_lines_count_includes_malformed_lines(self):
+        """Every object line is counted whether or not it was decoded."""
+        stdout = "\n".join(
+            [
+                '{"type":"system","subtype":"init","uuid":"abc","session_id":"sess-1","model":"qwen-coder"}',
+                "{bad json",
+                '{"type":"user","message":{"content":[]}}',
+                '{"type":"result","subtype":"success","uuid":"res-1","is_error":false,"num_turns":1,"result":"Done."}',
+            ]
+        )
+
+        result = QwenStreamJsonParser().parse(stdout, "")
+        kept = QwenStreamJsonParser(keep_raw_events=True).parse(stdout, "")
+
+        assert result.metadata["object_lines_count"] == kept.metadata["object_lines_count"] == 4
+        assert len(kept.metadata["raw_events"]) == 3
+
+    def test_keeps_only_last_raw_events_when_capped(self):
+        """Parser retains at most max_events decoded events when requested."""
+        stdout = "\n".join(
+            [
+                '{"type":"system","subtype":"init","uuid":"abc","session_id":"sess-1","model":"qwen-coder"}',
+                '{"type":"assistant","uuid":"msg-1","session_id":"sess-1","message":{"content":[{"type":"text","text":"Working."}]}}',
+                '{"type":"result","subtype":"success","uuid":"res-1","session_id":"sess-1","is_error":false,"num_turns":1,"result":"Done.","usage":{},"permission_denials":[]}',
+            ]
+        )
+
+        parser = QwenStreamJsonParser(keep_raw_events=True, max_events=1)
+        result = parser.parse(stdout, "")
+
+        assert result.metadata["object_lines_count"] == 3
+        assert [event["type"] for event in result.metadata["raw_events"]] == ["result"]
+
+    def test_rejects_invalid_max_events(self):
+        """Parser validates max_events at construction time."""
+        with pytest.raises(ValueError, match="non-negative"):
+            QwenStreamJsonParser(keep_raw_events=True, max_events=-1)
+
+        with pytest.raises(ValueError, match="requires keep_raw_events"):
+            QwenStreamJsonParser(max_events=5)
+
+    def test_skips_irrelevant_events_without_decoding(self):
+        """Parser ignores user/tool events but still finds spaced-out result events."""
+        stdout = "\n".join(
+            [
+                '{"type":"user","message":{"content":[{"type":"tool_result","content":"ok"}]}}',
+                '{"type": "result", "is_error": false, "num_turns": 1, "result": "Spaced."}',
+            ]
+        )
+
+        parser = QwenStreamJsonParser()
+        result = parser.parse(stdout, "")
+
+        assert result.content == "Spaced."
+        assert result.metadata["object_lines_count"] == 2
+
+    def test_stops_reading_after_result_event(self):
+        """Parser ignores trailing events once a result with text has been seen."""
+        stdout = "\n".join(
+            [
+                '{"type":"system","subtype":"init","uuid":"abc","session_id":"sess-1","model":"qwen-coder"}',
+                '{"type":"result","subtype":"success","uuid":"res-1","is_error":false,"num_turns":1,"result":"Final."}',
+                '{"type":"user","message":{"content":[]}}',
+                '{"type":"system","subtype":"shutdown","uuid":"def","session_id":"sess-2","model":"other"}',
+            ]
+        )
+
+        result = QwenStreamJsonParser().parse(stdout, "")
+        kept = QwenStreamJsonParser(keep_raw_events=True).parse(stdout, "")
+
+        assert result.content == kept.content == "Final."
+        assert result.metadata["session_id"] == "sess-1"
+        assert result.metadata["object_lines_count"] == 2
+
+        # Raw retention still reads the whole transcript without changing the response.
+        kept_metadata = dict(kept.metadata)
+        assert [event["type"] for event in kept_metadata.pop("raw_events")] == ["system", "result", "user", "system"]
+        assert kept_metadata.pop("object_lines_count") == 4
+        result_metadata = dict(result.metadata)
+        result_metadata.pop("object_lines_count")
+        assert result_metadata == kept_metadata
+
+    def test_reads_past_result_without_text(self):
+        """Parser keeps reading when the result event has no text to return."""
+        stdout = "\n".join(
+            [
+                '{"type":"result","subtype":"success","uuid":"res-1","is_error":false,"num_turns":1,"result":""}',
+                '{"type":"assistant","uuid":"msg-1","message":{"content":[{"type":"text","text":"late"}]}}',
+            ]
+        )
+
+        result = QwenStreamJsonParser().parse(stdout, "")
+        kept = QwenStreamJsonParser(keep_raw_events=True).parse(stdout, "")
+
+        assert result.content == kept.content == "late"
+        kept_metadata = dict(kept.metadata)
+        kept_metadata.pop("raw_events")
+        assert result.metadata == kept_metadata
+
+    def test_accepts_lone_surrogate_in_result(self):
+        """Parser keeps result lines that only the stdlib decoder accepts."""
+        stdout = "\n".join(
+            [
+                '{"type":"assistant","uuid":"msg-1","message":{"content":[{"type":"text","text":"partial"}]}}',
+                '{"type":"result","subtype":"success","uuid":"res-1","is_error":false,"num_turns":1,"result":"Final answer with cut emoji \\ud83d"}',
+            ]
+        )
+
+        result = QwenStreamJsonParser().parse(stdout, "")
+
+        assert result.content == "Final answer with cut emoji \ud83d"
 
     def test_handles_permission_denials(self):
         """Parser extracts permission denials from result."""
@@ -169,3 +285,23 @@ class TestQwenStreamJsonParser:
 
         assert len(result.metadata["permission_denials"]) == 1
         assert result.metadata["permission_denials"][0]["tool_name"] == "bash"
+
+    def test_parse_stream_accepts_file_like(self):
+        """Parser consumes lines directly from a file-like object."""
+        stream = io.StringIO(
+            "\n".join(
+                [
+                    '{"type":"system","subtype":"init","uuid":"abc","session_id":"sess-1","model":"qwen-coder"}',
+                    '{"type":"result","subtype":"success","uuid":"res-1","session_id":"sess-1","is_error":false,"duration_ms":1000,"num_turns":1,"result":"Streamed.","usage":{},"permission_denials":[]}',
+                ]
+            )
+        )
+
+        parser = QwenStreamJsonParser()
+        result = parser.parse_stream(stream, "")
+
+        assert result.content == "Streamed."
+        assert result.metadata["session_id"] == "sess-1"
+
+        with pytest.raises(ParserError, match="empty stdout"):
+            parser.parse_stream(io.StringIO("\n  \n"), "")